@@ -11,17 +11,26 @@ import pygame
 import random
 import math
 import sys
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # ----- Config -----
 SCREEN_W, SCREEN_H = 800, 600
+HALF_W, HALF_H = SCREEN_W // 2, SCREEN_H // 2
 WORLD_W, WORLD_H = 2400, 1800  # larger map
+CAM_MAX_X, CAM_MAX_Y = WORLD_W - SCREEN_W, WORLD_H - SCREEN_H  # camera clamp limits
 PLAYER_RADIUS = 16
 MOB_RADIUS = 14
 LAVA_RADIUS = 60
 LEVEL_DURATION_SECONDS = 10 * 60
 FPS = 60
+HUD_TICK_EVENT = pygame.USEREVENT + 1  # posted once a second to refresh the HUD timer
+HUD_GLYPHS = '0123456789: /ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'  # pre-rendered HUD characters
+
+# Squared contact radii (hot-path checks compare squared distances)
+PLAYER_MOB_R2 = (MOB_RADIUS + PLAYER_RADIUS) ** 2
+PLAYER_PROJ_R2 = (PLAYER_RADIUS + 6) ** 2
 
 # Obstacles tuning
 OBSTACLE_COUNT = 80
@@ -29,6 +38,8 @@ NEAR_RADIUS = 120           # radius to consider "nearby" for clustering
 MAX_NEARBY_OBSTACLES = 2    # maximum obstacles allowed in a cluster
 GRID_BIAS = 200             # bias placement toward grid spacing to spread them out
 OBSTACLE_SAFETY_MARGIN = 8  # extra spacing when checking overlap
+OBSTACLE_CELL = 128         # cell size of the static obstacle grid used for collision queries
+MOB_CELL = 128              # cell size of the per-frame mob grid used for target queries
 
 # Champion presets
 CHAMPIONS = {
@@ -61,16 +72,31 @@ CHAMPIONS = {
     }
 }
 
+# Obstacle colors per kind
+OBSTACLE_COLORS = {
+    'tree': (40, 90, 30),
+    'rock': (110, 110, 110),
+    'house': (150, 100, 70),
+    'water': (30, 80, 140),
+    'hay': (210, 200, 80),
+}
+
 # Enemy types
 ENEMY_TYPES = ['melee', 'shooter', 'lava']
 
-# ----- Dataclasses -----
-@dataclass
+# Steering offsets tried in order when a mob's direct step is blocked, as (cos, sin) pairs
+MELEE_ANGLES = tuple((math.cos(a), math.sin(a)) for a in map(math.radians, (0, 30, -30, 60, -60, 100, -100)))
+SHOOTER_ANGLES = tuple((math.cos(a), math.sin(a)) for a in map(math.radians, (0, 25, -25, 50, -50)))
+BACKUP_ANGLES = tuple((math.cos(a), math.sin(a)) for a in map(math.radians, (0, 25, -25)))
+
+# ----- Dataclasses (slotted: no per-instance __dict__, faster attribute access) -----
+@dataclass(slots=True)
 class Obstacle:
     rect: pygame.Rect
     kind: str  # for aesthetic (tree, rock, house, water, hay)
+    surf: Optional[pygame.Surface] = None  # pre-rendered look, filled in once the display exists
 
-@dataclass
+@dataclass(slots=True)
 class Projectile:
     x: float
     y: float
@@ -81,7 +107,7 @@ class Projectile:
     owner: str  # 'player' or 'mob'
     ttl: float = 6.0
 
-@dataclass
+@dataclass(slots=True)
 class LavaPool:
     x: float
     y: float
@@ -89,7 +115,7 @@ class LavaPool:
     duration: float
     tick: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class Mob:
     x: float
     y: float
@@ -99,7 +125,7 @@ class Mob:
     cooldown: float = 0.0
     id: int = field(default_factory=lambda: random.randint(0, 999999))
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     x: float
     y: float
@@ -110,10 +136,11 @@ class Player:
     attack_cooldown: float = 0.5
     attack_timer: float = 0.0
     champion: str = 'mage'
+    champion_name: str = CHAMPIONS['mage']['name']  # display name, kept in sync by choose_champion
     proj_speed: float = 420
     proj_dmg: float = 20
     attack_range: float = 520
-    attack_type: str = 'projectile'
+    is_ranged: bool = True  # projectile champion (False = melee)
 
 # ----- Helpers -----
 
@@ -121,19 +148,162 @@ def clamp(v, a, b):
     return max(a, min(b, v))
 
 
-def distance(ax, ay, bx, by):
-    return math.hypot(ax - bx, ay - by)
+def dist2(ax, ay, bx, by):
+    return (ax - bx) * (ax - bx) + (ay - by) * (ay - by)
 
 
-def circle_rect_collision(cx, cy, r, rect: pygame.Rect):
+def circle_rect_collision(cx, cy, r, bounds: Tuple[int, int, int, int]):
+    # bounds are (left, top, right, bottom), cached so no pygame.Rect attributes are read here
+    left, top, right, bottom = bounds
+    # cheap rejects/accepts before the exact test
+    if cx + r < left or cx - r > right or cy + r < top or cy - r > bottom:
+        return False
+    if left <= cx <= right and top <= cy <= bottom:
+        return True
     # closest point
-    closest_x = clamp(cx, rect.left, rect.right)
-    closest_y = clamp(cy, rect.top, rect.bottom)
-    return distance(cx, cy, closest_x, closest_y) <= r
+    closest_x = clamp(cx, left, right)
+    closest_y = clamp(cy, top, bottom)
+    return dist2(cx, cy, closest_x, closest_y) <= r * r
+
+
+def build_obstacle_grid(obstacles: List[Obstacle]) -> Dict[Tuple[int, int], List[Tuple[int, int, int, int]]]:
+    """
+    Bucket obstacle bounds (left, top, right, bottom) into a uniform grid of OBSTACLE_CELL cells.
+    An obstacle is stored in every cell its rect covers.
+    """
+    grid: Dict[Tuple[int, int], List[Tuple[int, int, int, int]]] = {}
+    for o in obstacles:
+        left, top, right, bottom = o.rect.left, o.rect.top, o.rect.right, o.rect.bottom
+        bounds = (left, top, right, bottom)
+        for gx in range(left // OBSTACLE_CELL, right // OBSTACLE_CELL + 1):
+            for gy in range(top // OBSTACLE_CELL, bottom // OBSTACLE_CELL + 1):
+                grid.setdefault((gx, gy), []).append(bounds)
+    return grid
+
+
+def obstacle_hit(grid, cx, cy, r):
+    # only obstacles in cells overlapping the circle's bounding box can collide;
+    # one spanning several cells may be tested twice, which is cheaper than deduping
+    for gx in range(int((cx - r) // OBSTACLE_CELL), int((cx + r) // OBSTACLE_CELL) + 1):
+        for gy in range(int((cy - r) // OBSTACLE_CELL), int((cy + r) // OBSTACLE_CELL) + 1):
+            cell = grid.get((gx, gy))
+            if cell:
+                for bounds in cell:
+                    if circle_rect_collision(cx, cy, r, bounds):
+                        return True
+    return False
+
+
+def point_near_obstacle(grid, x, y, margin):
+    # point inside any obstacle rect inflated by `margin` on every side (same edges as Rect.collidepoint)
+    for gx in range(int((x - margin) // OBSTACLE_CELL), int((x + margin) // OBSTACLE_CELL) + 1):
+        for gy in range(int((y - margin) // OBSTACLE_CELL), int((y + margin) // OBSTACLE_CELL) + 1):
+            cell = grid.get((gx, gy))
+            if cell:
+                for left, top, right, bottom in cell:
+                    if left - margin <= x < right + margin and top - margin <= y < bottom + margin:
+                        return True
+    return False
+
+
+def obstacles_near(grid, x, y, r) -> List[Tuple[int, int, int, int]]:
+    # bounds of every obstacle in the cells overlapping the box (x - r, y - r)..(x + r, y + r)
+    found = set()
+    for gx in range(int((x - r) // OBSTACLE_CELL), int((x + r) // OBSTACLE_CELL) + 1):
+        for gy in range(int((y - r) // OBSTACLE_CELL), int((y + r) // OBSTACLE_CELL) + 1):
+            cell = grid.get((gx, gy))
+            if cell:
+                found.update(cell)
+    return list(found)
+
+
+def steer(grid, x, y, vx, vy, step, angles):
+    """
+    Try a step of length `step` along (vx, vy) rotated by each (cos, sin) pair in turn.
+    Returns the first position clear of obstacles, or None if every direction is blocked.
+    """
+    # every candidate lies within `step` of (x, y): gather the obstacles once for the whole search
+    nearby = obstacles_near(grid, x, y, step + MOB_RADIUS)
+    for ca, sa in angles:
+        nx = x + (vx * ca - vy * sa) * step
+        ny = y + (vx * sa + vy * ca) * step
+        for bounds in nearby:
+            if circle_rect_collision(nx, ny, MOB_RADIUS, bounds):
+                break
+        else:
+            return nx, ny
+    return None
+
+
+def build_mob_grid(mobs: List[Mob]) -> Dict[Tuple[int, int], List[Mob]]:
+    # rebuilt once per frame since mobs move
+    grid: Dict[Tuple[int, int], List[Mob]] = {}
+    for m in mobs:
+        key = (int(m.x // MOB_CELL), int(m.y // MOB_CELL))
+        cell = grid.get(key)
+        if cell is None:
+            grid[key] = [m]
+        else:
+            cell.append(m)
+    return grid
+
+
+def nearest_mob(grid, x, y, max_range) -> Optional[Mob]:
+    """
+    Nearest mob within max_range of (x, y), or None.
+    Scans rings of cells outward and stops once no farther ring can hold a closer mob.
+    """
+    cx, cy = int(x // MOB_CELL), int(y // MOB_CELL)
+    best = None
+    best_d2 = max_range * max_range
+    for k in range(math.ceil(max_range / MOB_CELL) + 1):
+        if k == 0:
+            ring = [(cx, cy)]
+        else:
+            ring = [(gx, gy) for gx in range(cx - k, cx + k + 1) for gy in (cy - k, cy + k)]
+            ring += [(gx, gy) for gx in (cx - k, cx + k) for gy in range(cy - k + 1, cy + k)]
+        for key in ring:
+            cell = grid.get(key)
+            if cell:
+                for m in cell:
+                    d2 = dist2(x, y, m.x, m.y)
+                    if d2 <= best_d2:
+                        best, best_d2 = m, d2
+        # anything beyond ring k is at least k cells away
+        if best is not None and best_d2 <= (k * MOB_CELL) ** 2:
+            break
+    return best
+
+
+def mob_hit(grid, x, y, r) -> Optional[Mob]:
+    # first mob whose center is within r of (x, y), looking only at cells under the circle's bounding box
+    r2 = r * r
+    for gx in range(int((x - r) // MOB_CELL), int((x + r) // MOB_CELL) + 1):
+        for gy in range(int((y - r) // MOB_CELL), int((y + r) // MOB_CELL) + 1):
+            cell = grid.get((gx, gy))
+            if cell:
+                for m in cell:
+                    if dist2(x, y, m.x, m.y) <= r2:
+                        return m
+    return None
+
+
+def mobs_within(grid, x, y, r) -> List[Mob]:
+    # every mob whose center is within r of (x, y)
+    r2 = r * r
+    found = []
+    for gx in range(int((x - r) // MOB_CELL), int((x + r) // MOB_CELL) + 1):
+        for gy in range(int((y - r) // MOB_CELL), int((y + r) // MOB_CELL) + 1):
+            cell = grid.get((gx, gy))
+            if cell:
+                for m in cell:
+                    if dist2(x, y, m.x, m.y) <= r2:
+                        found.append(m)
+    return found
 
 # ----- Spawning & World -----
 
-def spawn_mob(minute: int, player_x: float, player_y: float, obstacles: List[Obstacle]) -> Mob:
+def spawn_mob(minute: int, player_x: float, player_y: float, obstacle_grid) -> Mob:
     """
     Spawn a mob at a safe location:
      - not too near the player
@@ -150,7 +320,7 @@ def spawn_mob(minute: int, player_x: float, player_y: float, obstacles: List[Obs
         y = clamp(y, 0, WORLD_H)
 
         # safety: not too near player spawn/position
-        if distance(x, y, player_x, player_y) < 300:
+        if dist2(x, y, player_x, player_y) < 300 * 300:
             tries += 1
             if tries > 300:
                 # fallback random
@@ -160,13 +330,8 @@ def spawn_mob(minute: int, player_x: float, player_y: float, obstacles: List[Obs
             continue
 
         # ensure not inside obstacles and not too close to obstacle edges
-        inside_obs = False
-        for o in obstacles:
-            # use inflated rect for safety margin
-            if o.rect.inflate(OBSTACLE_SAFETY_MARGIN * 2, OBSTACLE_SAFETY_MARGIN * 2).collidepoint(x, y):
-                inside_obs = True
-                break
-        if inside_obs:
+        # (only obstacles in the grid cells around the point are checked)
+        if point_near_obstacle(obstacle_grid, x, y, OBSTACLE_SAFETY_MARGIN):
             tries += 1
             if tries > 500:
                 # fallback random
@@ -198,6 +363,44 @@ def generate_obstacles(count=OBSTACLE_COUNT) -> List[Obstacle]:
     obs: List[Obstacle] = []
     kinds = ['tree', 'rock', 'house', 'water', 'hay']
 
+    # spatial hash of obstacle centers: cell -> indices into obs
+    grid = defaultdict(list)
+
+    def cell_of(cx, cy):
+        return cx // NEAR_RADIUS, cy // NEAR_RADIUS
+
+    def neighbors(cx, cy, reach=1):
+        # indices of obstacles whose centers lie in the cell block around (cx, cy)
+        gx, gy = cell_of(cx, cy)
+        for ix in range(gx - reach, gx + reach + 1):
+            for iy in range(gy - reach, gy + reach + 1):
+                cell = grid.get((ix, iy))
+                if cell:
+                    yield from cell
+
+    # obstacles are at most 160x140, so an overlapping one can have its center two cells away
+    overlap_reach = 2
+
+    def can_place(rect):
+        inflated = rect.inflate(OBSTACLE_SAFETY_MARGIN * 2, OBSTACLE_SAFETY_MARGIN * 2)
+        # ensure not overlapping (allow some spacing)
+        for i in neighbors(rect.centerx, rect.centery, overlap_reach):
+            if inflated.colliderect(obs[i].rect):
+                return False
+        # count nearby obstacles by center distance
+        nearby = 0
+        for i in neighbors(rect.centerx, rect.centery):
+            o = obs[i]
+            if dist2(o.rect.centerx, o.rect.centery, rect.centerx, rect.centery) < NEAR_RADIUS * NEAR_RADIUS:
+                nearby += 1
+                if nearby >= MAX_NEARBY_OBSTACLES:
+                    return False
+        return True
+
+    def add(rect):
+        grid[cell_of(rect.centerx, rect.centery)].append(len(obs))
+        obs.append(Obstacle(rect, random.choice(kinds)))
+
     # build grid-biased candidate centers
     candidates = []
     x_cells = max(4, WORLD_W // GRID_BIAS)
@@ -227,27 +430,10 @@ def generate_obstacles(count=OBSTACLE_COUNT) -> List[Obstacle]:
         # avoid center spawn area
         if rect.colliderect(center_area):
             continue
-
-        # ensure not overlapping (allow some spacing)
-        overlapped = False
-        for o in obs:
-            if rect.inflate(OBSTACLE_SAFETY_MARGIN * 2, OBSTACLE_SAFETY_MARGIN * 2).colliderect(o.rect):
-                overlapped = True
-                break
-        if overlapped:
+        if not can_place(rect):
             continue
 
-        # count nearby obstacles by center distance
-        nearby = 0
-        for o in obs:
-            if distance(o.rect.centerx, o.rect.centery, rect.centerx, rect.centery) < NEAR_RADIUS:
-                nearby += 1
-                if nearby >= MAX_NEARBY_OBSTACLES:
-                    break
-        if nearby >= MAX_NEARBY_OBSTACLES:
-            continue
-
-        obs.append(Obstacle(rect, random.choice(kinds)))
+        add(rect)
 
     # If we didn't reach target count, try random placement with same checks
     extra_tries = 0
@@ -259,54 +445,46 @@ def generate_obstacles(count=OBSTACLE_COUNT) -> List[Obstacle]:
         rect = pygame.Rect(x, y, w, h)
         if rect.colliderect(center_area):
             extra_tries += 1; continue
-        overlapped = any(rect.inflate(OBSTACLE_SAFETY_MARGIN * 2, OBSTACLE_SAFETY_MARGIN * 2).colliderect(o.rect) for o in obs)
-        if overlapped:
-            extra_tries += 1; continue
-        nearby = sum(1 for o in obs if distance(o.rect.centerx, o.rect.centery, rect.centerx, rect.centery) < NEAR_RADIUS)
-        if nearby >= MAX_NEARBY_OBSTACLES:
+        if not can_place(rect):
             extra_tries += 1; continue
-        obs.append(Obstacle(rect, random.choice(kinds)))
+        add(rect)
         extra_tries += 1
 
     # POST-PROCESS: ensure there are no clusters bigger than MAX_NEARBY_OBSTACLES
-    # Build adjacency by NEAR_RADIUS and prune components bigger than allowed.
-    def build_adj_list(ob_list):
-        n = len(ob_list)
-        adj = [[] for _ in range(n)]
-        for i in range(n):
-            for j in range(i + 1, n):
-                if distance(ob_list[i].rect.centerx, ob_list[i].rect.centery,
-                            ob_list[j].rect.centerx, ob_list[j].rect.centery) < NEAR_RADIUS:
-                    adj[i].append(j)
-                    adj[j].append(i)
-        return adj
-
-    def connected_components(adj):
-        visited = [False] * len(adj)
-        comps = []
-        for i in range(len(adj)):
-            if not visited[i]:
-                stack = [i]
-                comp = []
-                visited[i] = True
-                while stack:
-                    u = stack.pop()
-                    comp.append(u)
-                    for v in adj[u]:
-                        if not visited[v]:
-                            visited[v] = True
-                            stack.append(v)
-                comps.append(comp)
-        return comps
-
-    adj = build_adj_list(obs)
-    comps = connected_components(adj)
+    # Union obstacles closer than NEAR_RADIUS (disjoint-set) and prune components bigger than allowed.
+    n = len(obs)
+    parent = list(range(n))
+    degree = [0] * n
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # path halving
+            i = parent[i]
+        return i
+
+    # only pairs in neighboring grid cells can be within NEAR_RADIUS
+    for i in range(n):
+        ri = obs[i].rect
+        for j in neighbors(ri.centerx, ri.centery):
+            if j > i:
+                rj = obs[j].rect
+                if dist2(ri.centerx, ri.centery, rj.centerx, rj.centery) < NEAR_RADIUS * NEAR_RADIUS:
+                    degree[i] += 1
+                    degree[j] += 1
+                    root_i, root_j = find(i), find(j)
+                    if root_i != root_j:
+                        parent[root_j] = root_i
+
+    comps = {}
+    for i in range(n):
+        comps.setdefault(find(i), []).append(i)
+
     # If any component bigger than MAX_NEARBY_OBSTACLES, remove random obstacles until size is ok
     to_remove_indices = set()
-    for comp in comps:
+    for comp in comps.values():
         if len(comp) > MAX_NEARBY_OBSTACLES:
             # sort by degree (remove highest-degree or random) - remove until size satisfied
-            comp_sorted = sorted(comp, key=lambda idx: len(adj[idx]), reverse=True)
+            comp_sorted = sorted(comp, key=lambda idx: degree[idx], reverse=True)
             remove_needed = len(comp) - MAX_NEARBY_OBSTACLES
             for r in comp_sorted[:remove_needed]:
                 to_remove_indices.add(r)
@@ -319,6 +497,15 @@ def generate_obstacles(count=OBSTACLE_COUNT) -> List[Obstacle]:
 # ----- Main Game -----
 
 def main():
+    # names used in the per-frame update, bound as locals (LOAD_FAST instead of LOAD_GLOBAL)
+    _hypot, _cos, _sin, _TAU = math.hypot, math.cos, math.sin, math.tau
+    _runif = random.uniform
+    _clamp, _dist2 = clamp, dist2
+    _obstacle_hit, _steer, _mob_hit = obstacle_hit, steer, mob_hit
+    _WORLD_W, _WORLD_H = WORLD_W, WORLD_H
+    _MOB_R, _PLAYER_R = MOB_RADIUS, PLAYER_RADIUS
+    _PLAYER_MOB_R2, _PLAYER_PROJ_R2 = PLAYER_MOB_R2, PLAYER_PROJ_R2
+
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
     pygame.display.set_caption('Cartoon Survivor — Champions & World (Obstacle Fix v2)')
@@ -328,12 +515,122 @@ def main():
     big = pygame.font.SysFont(None, 40)
     title_font = pygame.font.SysFont(None, 28)
 
+    # text surfaces are combined with a single blits call onto a transparent surface
+    def compose(layout, size):
+        surf = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        # the pieces never overlap, so a MAX blend onto the transparent surface is a straight copy
+        surf.blits([(piece, pos, None, pygame.BLEND_RGBA_MAX) for piece, pos in layout], doreturn=False)
+        return surf
+
+    def compose_row(pieces, gap=0):
+        layout = []
+        x = 0
+        for piece in pieces:
+            layout.append((piece, (x, 0)))
+            x += piece.get_width() + gap
+        return compose(layout, (max(1, x - gap), font.get_height()))
+
+    # HUD text is composed from a glyph atlas instead of being rasterized by the font
+    hud_glyphs = {ch: font.render(ch, True, (20, 20, 20)).convert_alpha() for ch in HUD_GLYPHS}
+
+    def render_hud_text(text):
+        glyphs = []
+        for ch in text:
+            glyph = hud_glyphs.get(ch)
+            if glyph is None:
+                glyph = hud_glyphs[ch] = font.render(ch, True, (20, 20, 20)).convert_alpha()
+            glyphs.append(glyph)
+        return compose_row(glyphs)
+
+    # HUD pieces are only recomposed when their values change: key -> (values, surface)
+    hud_cache = {}
+    hud_gap = hud_glyphs[' '].get_width() * 2
+
+    def hud_piece(key, fmt, values):
+        cached = hud_cache.get(key)
+        if cached is None or cached[0] != values:
+            cached = (values, render_hud_text(fmt.format(*values)))
+            hud_cache[key] = cached
+        return cached[1]
+
+    # level-up / win / dead overlays are plain tints applied to the screen; only their texts are surfaces
+    def tint_screen(color):
+        # straight alpha blend of a solid color: dst * (1 - a) + color * a
+        r, g, b, a = color
+        keep = 255 - a
+        screen.fill((keep, keep, keep), special_flags=pygame.BLEND_RGB_MULT)
+        if r or g or b:
+            screen.fill((r * a // 255, g * a // 255, b * a // 255), special_flags=pygame.BLEND_RGB_ADD)
+
+    overlay_levelup = (10, 10, 20, 200)
+    overlay_win = (0, 0, 0, 160)
+    overlay_dead = (0, 0, 0, 200)
+    levelup_title = big.render('Level Up! Choose a bonus', True, (255, 240, 180)).convert_alpha()
+    levelup_hint = font.render('Press 1/2/3 to choose', True, (200, 200, 200)).convert_alpha()
+    win_text = big.render("You survived the level!", True, (255, 220, 120)).convert_alpha()
+    dead_text = big.render('You died — try again!', True, (255, 140, 140)).convert_alpha()
+
+    def centered(surf, y):
+        return surf, (HALF_W - surf.get_width() // 2, y)
+
+    # overlay texts go to the screen with premultiplied alpha (the cheaper blend path);
+    # Surface.premul_alpha needs pygame 2.1.4+, older versions keep plain alpha blits
+    premul = hasattr(pygame.Surface, 'premul_alpha')
+
+    def premultiplied(surf, pos):
+        if premul:
+            return surf.premul_alpha(), pos, None, pygame.BLEND_PREMULTIPLIED
+        return surf, pos, None, 0
+
+    # (surface, position) sequences ready for a single blits call
+    win_layout = (premultiplied(*centered(win_text, HALF_H - 20)),)
+    dead_layout = (premultiplied(*centered(dead_text, HALF_H - 20)),)
+
+    # level-up options: 2 and 3 never change, 1 is rendered once per level
+    levelup_fixed_opts = (
+        font.render('2) + Speed (movement)', True, (230, 230, 230)).convert_alpha(),
+        font.render('3) + Max HP & heal', True, (230, 230, 230)).convert_alpha(),
+    )
+    # everything but the damage option has a fixed place; option i sits at y = 180 + i * 36
+    levelup_layout = [centered(levelup_title, 80), centered(levelup_hint, 320)]
+    levelup_layout += [centered(txt, 180 + i * 36) for i, txt in enumerate(levelup_fixed_opts, 1)]
+    # the level-up texts are composed into one surface per level, cropped to their bounding box
+    levelup_menus = {}
+
+    def levelup_menu(level):
+        menu = levelup_menus.get(level)
+        if menu is None:
+            damage = font.render(f'1) + Damage ({int(8 + level*2)} dmg)', True, (230, 230, 230)).convert_alpha()
+            layout = [centered(damage, 180)] + levelup_layout
+            box = pygame.Rect(layout[0][1], layout[0][0].get_size()).unionall(
+                [pygame.Rect(pos, surf.get_size()) for surf, pos in layout[1:]])
+            surf = compose([(txt, (x - box.x, y - box.y)) for txt, (x, y) in layout], box.size)
+            menu = levelup_menus[level] = premultiplied(surf, box.topleft)
+        return menu
+
     # Prepare world
     player = Player(x=WORLD_W // 2, y=WORLD_H // 2)
     projectile_list: List[Projectile] = []
     lava_pools: List[LavaPool] = []
     mobs: List[Mob] = []
     obstacles = generate_obstacles(OBSTACLE_COUNT)
+    obstacle_grid = build_obstacle_grid(obstacles)
+    # pre-render obstacles so drawing them is a plain blit
+    for o in obstacles:
+        o.surf = pygame.Surface(o.rect.size).convert()
+        o.surf.fill(OBSTACLE_COLORS[o.kind])
+    # every lava pool shares one opaque circle, faded per pool with set_alpha
+    lava_surf = pygame.Surface((LAVA_RADIUS * 2, LAVA_RADIUS * 2), pygame.SRCALPHA)
+    pygame.draw.circle(lava_surf, (255, 120, 30, 255), (LAVA_RADIUS, LAVA_RADIUS), LAVA_RADIUS)
+    lava_surf = lava_surf.convert_alpha()
+    # static ground (grass + reference grid) rendered once for the whole world
+    world_bg = pygame.Surface((WORLD_W, WORLD_H)).convert()
+    world_bg.fill((90, 160, 110))
+    grid_color = (80, 130, 90)
+    for gx in range(0, WORLD_W, 200):
+        pygame.draw.line(world_bg, grid_color, (gx, 0), (gx, WORLD_H), 1)
+    for gy in range(0, WORLD_H, 200):
+        pygame.draw.line(world_bg, grid_color, (0, gy), (WORLD_W, gy), 1)
 
     elapsed = 0.0
     spawn_acc = 0.0
@@ -354,6 +651,22 @@ def main():
     # Champion select menu
     def champion_menu():
         nonlocal state, player
+        # menu texts are static: render and convert them once
+        title = big.render('Choose your Champion', True, (255, 220, 170)).convert_alpha()
+        title_entry = centered(title, 30)
+        # cards overlap slightly, so each card keeps its rect and texts together to preserve draw order
+        cards = []
+        for i, key in enumerate(['mage', 'rogue', 'knight']):
+            cx = int((i + 0.5) * SCREEN_W / 3)
+            cy = 180
+            name = title_font.render(CHAMPIONS[key]['name'], True, (240, 240, 240)).convert_alpha()
+            desc = font.render(CHAMPIONS[key]['desc'], True, (200, 200, 200)).convert_alpha()
+            hint = font.render(f'Press {i+1} or click to select', True, (180, 180, 180)).convert_alpha()
+            cards.append(((cx - 140, cy - 90, 280, 180), (
+                (name, (cx - name.get_width() // 2, cy - 64)),
+                (desc, (cx - desc.get_width() // 2, cy - 24)),
+                (hint, (cx - hint.get_width() // 2, cy + 36)),
+            )))
         while state == 'champ_select':
             dt = clock.tick(FPS) / 1000.0
             for ev in pygame.event.get():
@@ -376,20 +689,12 @@ def main():
                         choose_champion('knight'); return
 
             screen.fill((30, 40, 70))
-            title = big.render('Choose your Champion', True, (255, 220, 170))
-            screen.blit(title, (SCREEN_W // 2 - title.get_width() // 2, 30))
+            screen.blit(*title_entry)
 
             # draw three cards
-            for i, key in enumerate(['mage', 'rogue', 'knight']):
-                cx = int((i + 0.5) * SCREEN_W / 3)
-                cy = 180
-                pygame.draw.rect(screen, (20, 20, 30), (cx - 140, cy - 90, 280, 180), border_radius=8)
-                name = title_font.render(CHAMPIONS[key]['name'], True, (240, 240, 240))
-                screen.blit(name, (cx - name.get_width() // 2, cy - 64))
-                desc = font.render(CHAMPIONS[key]['desc'], True, (200, 200, 200))
-                screen.blit(desc, (cx - desc.get_width() // 2, cy - 24))
-                hint = font.render(f'Press {i+1} or click to select', True, (180, 180, 180))
-                screen.blit(hint, (cx - hint.get_width() // 2, cy + 36))
+            for rect, texts in cards:
+                pygame.draw.rect(screen, (20, 20, 30), rect, border_radius=8)
+                screen.blits(texts, doreturn=False)
 
             pygame.display.flip()
 
@@ -397,17 +702,27 @@ def main():
         nonlocal player, state
         p = CHAMPIONS[key]
         player.champion = key
+        player.champion_name = p['name']
         player.attack_cooldown = p['cooldown']
         player.proj_speed = p['proj_speed']
         player.proj_dmg = p['proj_dmg']
         player.attack_range = p['range']
-        player.attack_type = p['attack_type']
+        player.is_ranged = p['attack_type'] == 'projectile'
         state = 'playing'
 
     champion_menu()
 
     # Game loop
     running = True
+    # overlay screen currently on display; it only changes with state, level, or minute (mob tint)
+    presented = None
+    # HUD values of the last composed strip; the strip is reused while they stay the same
+    hud_key = None
+    hud_strip = None
+    # the timer only shows whole seconds, so it is refreshed by a 1 Hz event instead of every frame
+    # elapsed is past 0 from the first frame on, so the clock starts at one second below the full duration
+    remaining = LEVEL_DURATION_SECONDS - 1
+    pygame.time.set_timer(HUD_TICK_EVENT, 1000)
     while running:
         dt = clock.tick(FPS) / 1000.0
         elapsed += dt
@@ -416,6 +731,10 @@ def main():
         for ev in pygame.event.get():
             if ev.type == pygame.QUIT:
                 running = False
+            if ev.type == pygame.WINDOWEXPOSED:
+                presented = None  # window contents may be lost, present again
+            if ev.type == HUD_TICK_EVENT:
+                remaining = max(0, int(LEVEL_DURATION_SECONDS - elapsed))
             if ev.type == pygame.KEYDOWN:
                 if ev.key == pygame.K_ESCAPE:
                     running = False
@@ -440,115 +759,66 @@ def main():
             dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
             dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
             if dx != 0 or dy != 0:
-                ln = math.hypot(dx, dy)
+                ln = _hypot(dx, dy)
                 dx /= ln; dy /= ln
                 new_x = player.x + dx * player.speed * dt
                 new_y = player.y + dy * player.speed * dt
                 # collision with obstacles
-                can_move = True
-                for o in obstacles:
-                    if circle_rect_collision(new_x, new_y, PLAYER_RADIUS, o.rect):
-                        can_move = False
-                        break
-                if can_move:
-                    player.x = clamp(new_x, 0, WORLD_W)
-                    player.y = clamp(new_y, 0, WORLD_H)
+                if not _obstacle_hit(obstacle_grid, new_x, new_y, _PLAYER_R):
+                    player.x = _clamp(new_x, 0, _WORLD_W)
+                    player.y = _clamp(new_y, 0, _WORLD_H)
 
             # camera centers on player but constrained to world bounds
-            cam_x = clamp(player.x - SCREEN_W / 2, 0, WORLD_W - SCREEN_W)
-            cam_y = clamp(player.y - SCREEN_H / 2, 0, WORLD_H - SCREEN_H)
+            cam_x = _clamp(player.x - HALF_W, 0, CAM_MAX_X)
+            cam_y = _clamp(player.y - HALF_H, 0, CAM_MAX_Y)
 
-            # spawn mobs (pass obstacles so spawn avoids them)
+            # spawn mobs (pass the obstacle grid so spawn avoids them)
             spawn_interval = max(0.4, BASE_SPAWN - minute * 0.12)
             spawn_acc += dt
             while spawn_acc >= spawn_interval:
                 spawn_acc -= spawn_interval
-                mobs.append(spawn_mob(minute, player.x, player.y, obstacles))
+                mobs.append(spawn_mob(minute, player.x, player.y, obstacle_grid))
 
-            # update mobs
-            for mob in mobs[:]:
+            # update mobs (survivors are collected and swapped in once)
+            live_mobs: List[Mob] = []
+            for mob in mobs:
                 mob.cooldown = max(0.0, mob.cooldown - dt)
                 if mob.type == 'melee':
                     # move toward player with obstacle avoidance (steering)
                     vx = player.x - mob.x
                     vy = player.y - mob.y
-                    dist = math.hypot(vx, vy) or 1.0
+                    dist = (vx * vx + vy * vy) ** 0.5 or 1.0
                     vx /= dist; vy /= dist
 
                     # try direct step; if blocked, try angled offsets
-                    step = mob.speed * dt
-                    moved = False
-
-                    def try_move_with_vector(dx_unit, dy_unit):
-                        nx = mob.x + dx_unit * step
-                        ny = mob.y + dy_unit * step
-                        # check obstacle collision
-                        for o in obstacles:
-                            if circle_rect_collision(nx, ny, MOB_RADIUS, o.rect):
-                                return False, None, None
-                        return True, nx, ny
-
-                    # angles to try (in radians)
-                    angles = [0, math.radians(30), math.radians(-30), math.radians(60), math.radians(-60), math.radians(100), math.radians(-100)]
-                    for ang in angles:
-                        ca = math.cos(ang); sa = math.sin(ang)
-                        dx_try = vx * ca - vy * sa
-                        dy_try = vx * sa + vy * ca
-                        ok, nx, ny = try_move_with_vector(dx_try, dy_try)
-                        if ok:
-                            mob.x = clamp(nx, 0, WORLD_W)
-                            mob.y = clamp(ny, 0, WORLD_H)
-                            moved = True
-                            break
+                    pos = _steer(obstacle_grid, mob.x, mob.y, vx, vy, mob.speed * dt, MELEE_ANGLES)
+                    if pos:
+                        mob.x = _clamp(pos[0], 0, _WORLD_W)
+                        mob.y = _clamp(pos[1], 0, _WORLD_H)
 
                     # if couldn't move, remain (avoids tunneling into obstacle)
                     # contact damage
-                    if distance(mob.x, mob.y, player.x, player.y) <= MOB_RADIUS + PLAYER_RADIUS:
+                    if _dist2(mob.x, mob.y, player.x, player.y) <= _PLAYER_MOB_R2:
                         player.hp -= 12 * dt
 
                 elif mob.type == 'shooter':
                     # keep distance: back up if too close, approach if far (with steering)
                     vx = player.x - mob.x
                     vy = player.y - mob.y
-                    dist = math.hypot(vx, vy) or 1.0
+                    dist = (vx * vx + vy * vy) ** 0.5 or 1.0
                     vx /= dist; vy /= dist
                     desired = 380
 
-                    def attempt_translate(dx_unit, dy_unit, speed_mult=1.0):
-                        nx = mob.x + dx_unit * mob.speed * speed_mult * dt
-                        ny = mob.y + dy_unit * mob.speed * speed_mult * dt
-                        for o in obstacles:
-                            if circle_rect_collision(nx, ny, MOB_RADIUS, o.rect):
-                                return False, None, None
-                        return True, nx, ny
-
+                    pos = None
                     if dist > desired:
                         # approach using steering
-                        moved = False
-                        angles = [0, math.radians(25), math.radians(-25), math.radians(50), math.radians(-50)]
-                        for ang in angles:
-                            ca = math.cos(ang); sa = math.sin(ang)
-                            dx_try = vx * ca - vy * sa
-                            dy_try = vx * sa + vy * ca
-                            ok, nx, ny = attempt_translate(dx_try, dy_try)
-                            if ok:
-                                mob.x = clamp(nx, 0, WORLD_W)
-                                mob.y = clamp(ny, 0, WORLD_H)
-                                moved = True
-                                break
+                        pos = _steer(obstacle_grid, mob.x, mob.y, vx, vy, mob.speed * dt, SHOOTER_ANGLES)
                     elif dist < desired - 60:
                         # back up
-                        moved = False
-                        for ang in [0, math.radians(25), math.radians(-25)]:
-                            ca = math.cos(ang); sa = math.sin(ang)
-                            dx_try = -vx * ca + vy * sa
-                            dy_try = -vx * sa - vy * ca
-                            ok, nx, ny = attempt_translate(dx_try, dy_try)
-                            if ok:
-                                mob.x = clamp(nx, 0, WORLD_W)
-                                mob.y = clamp(ny, 0, WORLD_H)
-                                moved = True
-                                break
+                        pos = _steer(obstacle_grid, mob.x, mob.y, -vx, -vy, mob.speed * dt, BACKUP_ANGLES)
+                    if pos:
+                        mob.x = _clamp(pos[0], 0, _WORLD_W)
+                        mob.y = _clamp(pos[1], 0, _WORLD_H)
 
                     # shoot
                     if mob.cooldown <= 0 and dist <= 700:
@@ -557,103 +827,90 @@ def main():
                         pvx = dirx * ps
                         pvy = diry * ps
                         projectile_list.append(Projectile(mob.x, mob.y, pvx, pvy, ps, dmg=18 + minute * 2, owner='mob'))
-                        mob.cooldown = random.uniform(1.2, 2.0)
+                        mob.cooldown = _runif(1.2, 2.0)
 
                 elif mob.type == 'lava':
                     # wander slowly and occasionally drop lava pool
-                    ang = random.uniform(0, math.tau)
-                    nx = mob.x + math.cos(ang) * mob.speed * 0.25 * dt
-                    ny = mob.y + math.sin(ang) * mob.speed * 0.25 * dt
+                    ang = _runif(0, _TAU)
+                    nx = mob.x + _cos(ang) * mob.speed * 0.25 * dt
+                    ny = mob.y + _sin(ang) * mob.speed * 0.25 * dt
                     # check collision before moving
-                    blocked = False
-                    for o in obstacles:
-                        if circle_rect_collision(nx, ny, MOB_RADIUS, o.rect):
-                            blocked = True
-                            break
-                    if not blocked:
-                        mob.x = clamp(nx, 0, WORLD_W)
-                        mob.y = clamp(ny, 0, WORLD_H)
+                    if not _obstacle_hit(obstacle_grid, nx, ny, _MOB_R):
+                        mob.x = _clamp(nx, 0, _WORLD_W)
+                        mob.y = _clamp(ny, 0, _WORLD_H)
 
                     if mob.cooldown <= 0:
-                        lava_pools.append(LavaPool(mob.x, mob.y, LAVA_RADIUS, duration=6.0 + random.uniform(-1, 2)))
-                        mob.cooldown = 4.0 + random.uniform(0, 3.0)
+                        lava_pools.append(LavaPool(mob.x, mob.y, LAVA_RADIUS, duration=6.0 + _runif(-1, 2)))
+                        mob.cooldown = 4.0 + _runif(0, 3.0)
 
                 # remove mob if dead
                 if mob.hp <= 0:
-                    try:
-                        mobs.remove(mob)
-                    except ValueError:
-                        pass
                     player.xp += 1
+                    continue
+                live_mobs.append(mob)
+            mobs = live_mobs
+
+            mob_grid = build_mob_grid(mobs)
 
             # update projectiles
-            for p in projectile_list[:]:
+            # survivors are collected and swapped in once, instead of removing from the list mid-loop
+            live_projectiles: List[Projectile] = []
+            for p in projectile_list:
                 p.ttl -= dt
                 p.x += p.vx * dt
                 p.y += p.vy * dt
                 # world collisions
-                if p.ttl <= 0 or not (0 <= p.x <= WORLD_W and 0 <= p.y <= WORLD_H):
-                    if p in projectile_list:
-                        projectile_list.remove(p)
+                if p.ttl <= 0 or not (0 <= p.x <= _WORLD_W and 0 <= p.y <= _WORLD_H):
                     continue
                 # hit obstacles (stop / disappear)
-                hit_obs = False
-                for o in obstacles:
-                    if circle_rect_collision(p.x, p.y, 4, o.rect):
-                        hit_obs = True
-                        break
-                if hit_obs:
-                    if p in projectile_list:
-                        projectile_list.remove(p)
+                if _obstacle_hit(obstacle_grid, p.x, p.y, 4):
                     continue
                 # hit player
-                if p.owner == 'mob' and distance(p.x, p.y, player.x, player.y) <= PLAYER_RADIUS + 6:
+                if p.owner == 'mob' and _dist2(p.x, p.y, player.x, player.y) <= _PLAYER_PROJ_R2:
                     player.hp -= p.dmg
-                    if p in projectile_list:
-                        projectile_list.remove(p)
                     continue
                 # hit mobs (player projectiles)
                 if p.owner == 'player':
-                    for mob in mobs[:]:
-                        if distance(p.x, p.y, mob.x, mob.y) <= MOB_RADIUS + 6:
-                            mob.hp -= p.dmg
-                            if p in projectile_list:
-                                projectile_list.remove(p)
-                            break
+                    mob = _mob_hit(mob_grid, p.x, p.y, _MOB_R + 6)
+                    if mob is not None:
+                        mob.hp -= p.dmg
+                        continue
+                live_projectiles.append(p)
+            projectile_list = live_projectiles
 
             # update lava pools
-            for lava in lava_pools[:]:
+            live_pools: List[LavaPool] = []
+            for lava in lava_pools:
                 lava.duration -= dt
                 lava.tick += dt
                 if lava.duration <= 0:
-                    lava_pools.remove(lava)
                     continue
                 # damage player if inside
-                if distance(player.x, player.y, lava.x, lava.y) <= lava.radius:
+                if _dist2(player.x, player.y, lava.x, lava.y) <= lava.radius * lava.radius:
                     player.hp -= 28 * dt
+                live_pools.append(lava)
+            lava_pools = live_pools
 
             # Player auto-attack by champion
             player.attack_timer -= dt
             if player.attack_timer <= 0:
                 # find nearest mob in range
-                if mobs:
-                    nearest = min(mobs, key=lambda m: distance(player.x, player.y, m.x, m.y))
-                    dist = distance(player.x, player.y, nearest.x, nearest.y)
-                    if dist <= player.attack_range:
-                        if player.attack_type == 'projectile':
-                            # shoot one projectile at nearest
-                            dx = (nearest.x - player.x) / (dist or 1)
-                            dy = (nearest.y - player.y) / (dist or 1)
-                            pvx = dx * player.proj_speed
-                            pvy = dy * player.proj_speed
-                            projectile_list.append(Projectile(player.x, player.y, pvx, pvy, player.proj_speed, player.proj_dmg, owner='player'))
-                            player.attack_timer = player.attack_cooldown
-                        else:  # melee
-                            # damage mobs in melee range
-                            for mob in mobs[:]:
-                                if distance(player.x, player.y, mob.x, mob.y) <= player.attack_range + MOB_RADIUS:
-                                    mob.hp -= player.proj_dmg
-                            player.attack_timer = player.attack_cooldown
+                nearest = nearest_mob(mob_grid, player.x, player.y, player.attack_range)
+                if nearest is not None:
+                    if player.is_ranged:
+                        # shoot one projectile at nearest
+                        dist = _dist2(player.x, player.y, nearest.x, nearest.y) ** 0.5
+                        dx = (nearest.x - player.x) / (dist or 1)
+                        dy = (nearest.y - player.y) / (dist or 1)
+                        pvx = dx * player.proj_speed
+                        pvy = dy * player.proj_speed
+                        projectile_list.append(Projectile(player.x, player.y, pvx, pvy, player.proj_speed, player.proj_dmg, owner='player'))
+                        player.attack_timer = player.attack_cooldown
+                    else:  # melee
+                        # damage mobs in melee range
+                        for mob in mobs_within(mob_grid, player.x, player.y, player.attack_range + _MOB_R):
+                            mob.hp -= player.proj_dmg
+                        player.attack_timer = player.attack_cooldown
 
             # Level up check
             if player.xp >= player.level * 5:
@@ -667,63 +924,65 @@ def main():
                 state = 'dead'
 
         # ----- Drawing -----
-        screen.fill((90, 160, 110))  # background base (grass)
+        if state != 'playing':
+            # the world is frozen under the overlays: draw and present them once
+            if presented == (state, player.level, minute):
+                continue
+            presented = (state, player.level, minute)
 
         if state in ('playing', 'levelup', 'dead', 'win'):
             # recompute camera for safety outside playing loop too
-            cam_x = clamp(player.x - SCREEN_W / 2, 0, WORLD_W - SCREEN_W)
-            cam_y = clamp(player.y - SCREEN_H / 2, 0, WORLD_H - SCREEN_H)
-
-            # draw ground (grid for reference)
-            grid_color = (80, 130, 90)
-            for gx in range(0, WORLD_W, 200):
-                sx, _ = world_to_screen(gx, 0)
-                pygame.draw.line(screen, grid_color, (sx, 0), (sx, SCREEN_H), 1)
-            for gy in range(0, WORLD_H, 200):
-                _, sy = world_to_screen(0, gy)
-                pygame.draw.line(screen, grid_color, (0, sy), (SCREEN_W, sy), 1)
+            cam_x = clamp(player.x - HALF_W, 0, CAM_MAX_X)
+            cam_y = clamp(player.y - HALF_H, 0, CAM_MAX_Y)
+
+            # visible world area, padded so partially visible shapes are still drawn
+            view = pygame.Rect(int(cam_x), int(cam_y), SCREEN_W, SCREEN_H).inflate(64, 64)
+
+            blit = screen.blit
+            # draw ground: one blit of the visible part of the pre-rendered background
+            blit(world_bg, (0, 0), (math.ceil(cam_x), math.ceil(cam_y), SCREEN_W, SCREEN_H))
 
             # draw obstacles
             for o in obstacles:
+                if not view.colliderect(o.rect):
+                    continue
                 sx, sy = world_to_screen(o.rect.x, o.rect.y)
-                # different visuals per kind
-                if o.kind == 'tree':
-                    pygame.draw.rect(screen, (40, 90, 30), (sx, sy, o.rect.w, o.rect.h))
-                elif o.kind == 'rock':
-                    pygame.draw.rect(screen, (110, 110, 110), (sx, sy, o.rect.w, o.rect.h))
-                elif o.kind == 'house':
-                    pygame.draw.rect(screen, (150, 100, 70), (sx, sy, o.rect.w, o.rect.h))
-                elif o.kind == 'water':
-                    pygame.draw.rect(screen, (30, 80, 140), (sx, sy, o.rect.w, o.rect.h))
-                else:
-                    pygame.draw.rect(screen, (210, 200, 80), (sx, sy, o.rect.w, o.rect.h))
+                blit(o.surf, (sx, sy))
 
             # draw lava pools under entities
             for lava in lava_pools:
+                if not (view.left - lava.radius <= lava.x <= view.right + lava.radius
+                        and view.top - lava.radius <= lava.y <= view.bottom + lava.radius):
+                    continue
                 sx, sy = world_to_screen(lava.x, lava.y)
-                alpha = int(160 * max(0.2, lava.duration / 6.0))
-                surf = pygame.Surface((lava.radius * 2, lava.radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(surf, (255, 120, 30, alpha), (lava.radius, lava.radius), int(lava.radius))
-                screen.blit(surf, (sx - lava.radius, sy - lava.radius))
+                lava_surf.set_alpha(int(160 * max(0.2, lava.duration / 6.0)))
+                blit(lava_surf, (sx - lava.radius, sy - lava.radius))
 
+            # mobs, player and projectiles are pure draw calls: lock the screen once for all of them
+            # (blits must stay outside, a locked surface can't be blitted to)
+            screen.lock()
             # draw mobs
+            draw_circle, draw_rect = pygame.draw.circle, pygame.draw.rect
             for mob in mobs:
+                # padding covers the body and the HP bar above it
+                if not (view.left <= mob.x <= view.right and view.top <= mob.y <= view.bottom):
+                    continue
                 sx, sy = world_to_screen(mob.x, mob.y)
                 # health fraction
                 maxhp = 22 + minute * 15
                 frac = max(0.05, min(1.0, mob.hp / maxhp))
                 color = (int(220 * frac + 30), int(80 * (1 - frac)), 70)
-                pygame.draw.circle(screen, color, (int(sx), int(sy)), MOB_RADIUS)
+                draw_circle(screen, color, (int(sx), int(sy)), MOB_RADIUS)
                 # simple HP bar
                 bar_w = 28
-                pygame.draw.rect(screen, (30, 30, 30), (sx - bar_w//2, sy - MOB_RADIUS - 10, bar_w, 6))
-                pygame.draw.rect(screen, (180, 60, 60), (sx - bar_w//2, sy - MOB_RADIUS - 10, int(bar_w * frac), 6))
+                draw_rect(screen, (30, 30, 30), (sx - bar_w//2, sy - MOB_RADIUS - 10, bar_w, 6))
+                draw_rect(screen, (180, 60, 60), (sx - bar_w//2, sy - MOB_RADIUS - 10, int(bar_w * frac), 6))
 
             # draw player (on top)
             px, py = world_to_screen(player.x, player.y)
             pygame.draw.circle(screen, (40, 110, 230), (int(px), int(py)), PLAYER_RADIUS)
             # draw player ring for attack range (faint)
-            if player.attack_type == 'projectile':
+            if player.is_ranged:
                 if player.attack_timer <= 0:
                     pygame.draw.circle(screen, (255, 255, 200), (int(px), int(py)), int(min(player.attack_range, 300)), 1)
             else:
@@ -731,48 +990,41 @@ def main():
 
             # draw projectiles
             for p in projectile_list:
+                if not (view.left <= p.x <= view.right and view.top <= p.y <= view.bottom):
+                    continue
                 sx, sy = world_to_screen(p.x, p.y)
                 col = (230, 140, 40) if p.owner == 'player' else (40, 40, 40)
-                pygame.draw.circle(screen, col, (int(sx), int(sy)), 5)
-
-            # HUD
-            remaining = max(0, int(LEVEL_DURATION_SECONDS - elapsed))
-            mins = remaining // 60
-            secs = remaining % 60
-            hud = font.render(f'Time {mins:02d}:{secs:02d}  HP {int(player.hp)}  Lv {player.level}  XP {player.xp}/{player.level*5}  Champ {CHAMPIONS[player.champion]["name"]}', True, (20, 20, 20))
-            screen.blit(hud, (8, 8))
+                draw_circle(screen, col, (int(sx), int(sy)), 5)
+            screen.unlock()
+
+            # HUD (skipped while an overlay covers the screen)
+            if state == 'playing':
+                key = (remaining, int(player.hp), player.level, player.xp, player.champion)
+                if key != hud_key:
+                    mins = remaining // 60
+                    secs = remaining % 60
+                    hud_strip = compose_row((
+                        hud_piece('time', 'Time {:02d}:{:02d}', (mins, secs)),
+                        hud_piece('hp', 'HP {}', (int(player.hp),)),
+                        hud_piece('lv', 'Lv {}', (player.level,)),
+                        hud_piece('xp', 'XP {}/{}', (player.xp, player.level * 5)),
+                        hud_piece('champ', 'Champ {}', (player.champion_name,)),
+                    ), hud_gap)
+                    hud_key = key
+                blit(hud_strip, (8, 8))
 
         # level up menu
         if state == 'levelup':
-            overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-            overlay.fill((10, 10, 20, 200))
-            screen.blit(overlay, (0, 0))
-            title = big.render('Level Up! Choose a bonus', True, (255, 240, 180))
-            screen.blit(title, (SCREEN_W // 2 - title.get_width() // 2, 80))
-            opts = [
-                f'1) + Damage ({int(8 + player.level*2)} dmg)',
-                '2) + Speed (movement)',
-                '3) + Max HP & heal',
-            ]
-            for i, t in enumerate(opts):
-                txt = font.render(t, True, (230, 230, 230))
-                screen.blit(txt, (SCREEN_W // 2 - txt.get_width() // 2, 180 + i * 36))
-            hint = font.render('Press 1/2/3 to choose', True, (200, 200, 200))
-            screen.blit(hint, (SCREEN_W // 2 - hint.get_width() // 2, 320))
+            tint_screen(overlay_levelup)
+            screen.blit(*levelup_menu(player.level))
 
         if state == 'win':
-            overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
-            text = big.render("You survived the level!", True, (255, 220, 120))
-            screen.blit(text, (SCREEN_W // 2 - text.get_width() // 2, SCREEN_H // 2 - 20))
+            tint_screen(overlay_win)
+            screen.blits(win_layout, doreturn=False)
 
         if state == 'dead':
-            overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 200))
-            screen.blit(overlay, (0, 0))
-            text = big.render('You died — try again!', True, (255, 140, 140))
-            screen.blit(text, (SCREEN_W // 2 - text.get_width() // 2, SCREEN_H // 2 - 20))
+            tint_screen(overlay_dead)
+            screen.blits(dead_layout, doreturn=False)
 
         pygame.display.flip()
 